@@ -3,116 +3,191 @@ db.py — In-memory database for the Leave Management System.
 Stores employee records and leave requests. Pre-seeded with sample data.
 """
 
+import itertools
+from dataclasses import dataclass
 from datetime import datetime, date
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
+# ─────────────────────────────────────────────
+#  RECORD TYPES
+# ─────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Employee:
+    """An employee and their remaining leave days per type."""
+    id: str
+    name: str
+    department: str
+    role: str
+    email: str
+    manager_id: Optional[str]
+    leave_balance: dict[str, int]
+
+    def as_dict(self) -> dict:
+        """Plain-dict copy for JSON serialisation only; formatters read attributes directly."""
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
+@dataclass(slots=True)
+class Leave:
+    """A single leave request."""
+    leave_id: str
+    employee_id: str
+    employee_name: str
+    leave_type: str
+    start_date: str
+    end_date: str
+    days: int
+    reason: str
+    status: str
+    rejection_reason: Optional[str]
+    created_at: str
+    updated_at: str
+
+    def as_dict(self) -> dict:
+        """Plain-dict copy for JSON serialisation only; formatters read attributes directly."""
+        return {f: getattr(self, f) for f in self.__slots__}
+
+
 # ─────────────────────────────────────────────
 #  EMPLOYEE STORE
 # ─────────────────────────────────────────────
 
-EMPLOYEES: dict[str, dict] = {
-    "E001": {
-        "id": "E001",
-        "name": "Alice Johnson",
-        "department": "Engineering",
-        "role": "Software Engineer",
-        "email": "alice.johnson@company.com",
-        "manager_id": "E003",
-        "leave_balance": {
+EMPLOYEES: dict[str, Employee] = {
+    "E001": Employee(
+        id="E001",
+        name="Alice Johnson",
+        department="Engineering",
+        role="Software Engineer",
+        email="alice.johnson@company.com",
+        manager_id="E003",
+        leave_balance={
             "casual": 10,
             "sick": 12,
             "annual": 20,
             "maternity": 0,
             "paternity": 5,
         },
-    },
-    "E002": {
-        "id": "E002",
-        "name": "Bob Smith",
-        "department": "Marketing",
-        "role": "Marketing Analyst",
-        "email": "bob.smith@company.com",
-        "manager_id": "E004",
-        "leave_balance": {
+    ),
+    "E002": Employee(
+        id="E002",
+        name="Bob Smith",
+        department="Marketing",
+        role="Marketing Analyst",
+        email="bob.smith@company.com",
+        manager_id="E004",
+        leave_balance={
             "casual": 8,
             "sick": 10,
             "annual": 18,
             "maternity": 0,
             "paternity": 5,
         },
-    },
-    "E003": {
-        "id": "E003",
-        "name": "Carol Williams",
-        "department": "Engineering",
-        "role": "Engineering Manager",
-        "email": "carol.williams@company.com",
-        "manager_id": None,
-        "leave_balance": {
+    ),
+    "E003": Employee(
+        id="E003",
+        name="Carol Williams",
+        department="Engineering",
+        role="Engineering Manager",
+        email="carol.williams@company.com",
+        manager_id=None,
+        leave_balance={
             "casual": 10,
             "sick": 12,
             "annual": 25,
             "maternity": 90,
             "paternity": 0,
         },
-    },
-    "E004": {
-        "id": "E004",
-        "name": "David Brown",
-        "department": "HR",
-        "role": "HR Manager",
-        "email": "david.brown@company.com",
-        "manager_id": None,
-        "leave_balance": {
+    ),
+    "E004": Employee(
+        id="E004",
+        name="David Brown",
+        department="HR",
+        role="HR Manager",
+        email="david.brown@company.com",
+        manager_id=None,
+        leave_balance={
             "casual": 10,
             "sick": 12,
             "annual": 22,
             "maternity": 0,
             "paternity": 5,
         },
-    },
-    "E005": {
-        "id": "E005",
-        "name": "Eva Martinez",
-        "department": "Finance",
-        "role": "Financial Analyst",
-        "email": "eva.martinez@company.com",
-        "manager_id": "E004",
-        "leave_balance": {
+    ),
+    "E005": Employee(
+        id="E005",
+        name="Eva Martinez",
+        department="Finance",
+        role="Financial Analyst",
+        email="eva.martinez@company.com",
+        manager_id="E004",
+        leave_balance={
             "casual": 9,
             "sick": 11,
             "annual": 19,
             "maternity": 90,
             "paternity": 0,
         },
-    },
+    ),
 }
 
+# (lowercased name, employee) pairs for case-insensitive name search.
+_NAME_INDEX: list[tuple[str, Employee]] = [(e.name.lower(), e) for e in EMPLOYEES.values()]
+
+# Directory view of each employee without leave balances, built once and
+# kept in sync by _add_employee.
+PUBLIC_EMPLOYEE_FIELDS = ("id", "name", "department", "role", "email", "manager_id")
+_public_fields = attrgetter(*PUBLIC_EMPLOYEE_FIELDS)
+EMPLOYEE_PUBLIC: dict[str, dict] = {
+    eid: dict(zip(PUBLIC_EMPLOYEE_FIELDS, _public_fields(e))) for eid, e in EMPLOYEES.items()
+}
+
+# Bumped whenever the employee directory changes, so cached views can be rebuilt.
+EMPLOYEES_VERSION = 0
+
 # ─────────────────────────────────────────────
 #  LEAVE STORE
 # ─────────────────────────────────────────────
 
-LEAVES: dict[str, dict] = {}
-_leave_counter = 1
+LEAVES: dict[str, Leave] = {}
+_leave_counter = itertools.count(1)
+
+# Secondary indexes over LEAVES, kept in submission order.
+# _PENDING_IDS is a dict used as an ordered set.
+_PENDING_IDS: dict[str, None] = {}
+_LEAVES_BY_EMP: dict[str, list[str]] = {}
 
-VALID_LEAVE_TYPES = {"casual", "sick", "annual", "maternity", "paternity"}
-VALID_STATUSES = {"pending", "approved", "rejected", "cancelled"}
+# Bumped on every leave create or status change, so cached views can be rebuilt.
+LEAVES_VERSION = 0
+
+LEAVE_TYPES = ("casual", "sick", "annual", "maternity", "paternity")
+VALID_LEAVE_TYPES = frozenset(LEAVE_TYPES)
+VALID_STATUSES = frozenset({"pending", "approved", "rejected", "cancelled"})
+_VALID_LEAVE_TYPES_STR = ", ".join(sorted(VALID_LEAVE_TYPES))
 
 
 # ─────────────────────────────────────────────
 #  HELPER FUNCTIONS
 # ─────────────────────────────────────────────
 
+def _leaves_changed() -> None:
+    global LEAVES_VERSION
+    LEAVES_VERSION += 1
+
+
 def _new_leave_id() -> str:
-    global _leave_counter
-    lid = f"L{_leave_counter:03d}"
-    _leave_counter += 1
-    return lid
+    return f"L{next(_leave_counter):03d}"
 
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> date:
     """Parse a date string in YYYY-MM-DD format."""
-    return datetime.strptime(date_str, "%Y-%m-%d").date()
+    # fromisoformat also takes e.g. "20260301" or week dates; keep only the canonical form.
+    if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+        raise ValueError(f"Invalid date '{date_str}'. Use YYYY-MM-DD format.")
+    return date.fromisoformat(date_str)
 
 
 def _count_days(start: str, end: str) -> int:
@@ -127,119 +202,229 @@ def _count_days(start: str, end: str) -> int:
 
 # ── Employee helpers ──────────────────────────
 
-def find_employee(employee_id: Optional[str] = None, name: Optional[str] = None) -> Optional[dict]:
-    """Return employee dict by ID or by (partial, case-insensitive) name."""
+def _adjust_balance(employee_id: str, leave_type: str, delta: int) -> int:
+    """Add delta (may be negative) to an employee's balance. Returns the new balance."""
+    balances = EMPLOYEES[employee_id].leave_balance
+    balances[leave_type] += delta
+    return balances[leave_type]
+
+
+def find_employee(employee_id: Optional[str] = None, name: Optional[str] = None) -> Optional[Employee]:
+    """Return employee by ID or by (partial, case-insensitive) name."""
     if employee_id:
         return EMPLOYEES.get(employee_id.upper())
     if name:
         name_lower = name.lower()
-        for emp in EMPLOYEES.values():
-            if name_lower in emp["name"].lower():
+        for lname, emp in _NAME_INDEX:
+            if name_lower in lname:
                 return emp
     return None
 
 
-def get_all_employees() -> list[dict]:
+def _add_employee(emp: Employee) -> None:
+    """
+    Insert an employee record. This is the only supported way to add one:
+    it keeps EMPLOYEES, _NAME_INDEX and EMPLOYEE_PUBLIC coherent and bumps
+    EMPLOYEES_VERSION so cached directory views are rebuilt.
+    """
+    global EMPLOYEES_VERSION
+    EMPLOYEES[emp.id] = emp
+    EMPLOYEE_PUBLIC[emp.id] = dict(zip(PUBLIC_EMPLOYEE_FIELDS, _public_fields(emp)))
+    _NAME_INDEX.append((emp.name.lower(), emp))
+    EMPLOYEES_VERSION += 1
+
+
+def get_all_employees() -> list[Employee]:
     return list(EMPLOYEES.values())
 
 
-# ── Leave helpers ─────────────────────────────
+def get_employee_directory() -> list[dict]:
+    """Public employee records (no leave balances)."""
+    return list(EMPLOYEE_PUBLIC.values())
 
-def create_leave(employee_id: str, leave_type: str, start_date: str,
-                 end_date: str, reason: str) -> dict:
-    """Create and store a new leave request. Returns the leave record."""
-    emp = EMPLOYEES.get(employee_id.upper())
+
+# ── Leave helpers ─────────────────────────────
+# The write-path helpers below take the module globals they use as
+# keyword-only defaults (e.g. _LEAVES=LEAVES), turning global lookups into
+# local ones. Callers never pass these arguments.
+
+def _validate_leave(employee_id: str, leave_type: str, start_date: str,
+                    end_date: str, *, _EMP=EMPLOYEES, _VALID=VALID_LEAVE_TYPES,
+                    _days=_count_days) -> tuple[Employee, str, int]:
+    """Check a leave request against the store. Returns (employee, leave_type, days)."""
+    emp = _EMP.get(employee_id.upper())
     if not emp:
         raise ValueError(f"Employee '{employee_id}' not found.")
 
     leave_type = leave_type.lower()
-    if leave_type not in VALID_LEAVE_TYPES:
-        raise ValueError(f"Invalid leave type '{leave_type}'. Valid types: {', '.join(sorted(VALID_LEAVE_TYPES))}")
+    if leave_type not in _VALID:
+        raise ValueError(f"Invalid leave type '{leave_type}'. Valid types: {_VALID_LEAVE_TYPES_STR}")
 
-    days = _count_days(start_date, end_date)
-    balance = emp["leave_balance"].get(leave_type, 0)
+    days = _days(start_date, end_date)
+    balance = emp.leave_balance.get(leave_type, 0)
     if days > balance:
         raise ValueError(
             f"Insufficient {leave_type} leave balance. "
             f"Requested: {days} day(s), Available: {balance} day(s)."
         )
-
-    lid = _new_leave_id()
-    record = {
-        "leave_id": lid,
-        "employee_id": employee_id.upper(),
-        "employee_name": emp["name"],
-        "leave_type": leave_type,
-        "start_date": start_date,
-        "end_date": end_date,
-        "days": days,
-        "reason": reason,
-        "status": "pending",
-        "rejection_reason": None,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    }
-    LEAVES[lid] = record
+    return emp, leave_type, days
+
+
+def _store_leave(emp: Employee, leave_type: str, start_date: str, end_date: str,
+                 days: int, reason: str, now_str: str, *, _LEAVES=LEAVES,
+                 _PENDING=_PENDING_IDS, _BY_EMP=_LEAVES_BY_EMP,
+                 _new_id=_new_leave_id, _changed=_leaves_changed) -> Leave:
+    """Build a pending leave record, add it to the store and indexes, and return it."""
+    lid = _new_id()
+    record = Leave(
+        leave_id=lid,
+        employee_id=emp.id,
+        employee_name=emp.name,
+        leave_type=leave_type,
+        start_date=start_date,
+        end_date=end_date,
+        days=days,
+        reason=reason,
+        status="pending",
+        rejection_reason=None,
+        created_at=now_str,
+        updated_at=now_str,
+    )
+    _LEAVES[lid] = record
+    _PENDING[lid] = None
+    _BY_EMP.setdefault(record.employee_id, []).append(lid)
+    _changed()
     return record
 
 
-def get_leave(leave_id: str) -> Optional[dict]:
+def create_leave(employee_id: str, leave_type: str, start_date: str,
+                 end_date: str, reason: str, *, _validate=_validate_leave,
+                 _store=_store_leave, _now=datetime.now) -> Leave:
+    """Create and store a new leave request. Returns the leave record."""
+    emp, leave_type, days = _validate(employee_id, leave_type, start_date, end_date)
+    now_str = _now().strftime("%Y-%m-%d %H:%M:%S")
+    return _store(emp, leave_type, start_date, end_date, days, reason, now_str)
+
+
+def create_leaves_bulk(records: list[dict], *, _validate=_validate_leave,
+                       _store=_store_leave, _now=datetime.now) -> list[Leave]:
+    """
+    Create many leave requests at once. Each item needs the same keys as the
+    arguments of create_leave. Every item is validated before any is stored,
+    so a bad or incomplete item raises ValueError and leaves the store untouched.
+    """
+    checked = []
+    for i, r in enumerate(records):
+        try:
+            start_date, end_date, reason = r["start_date"], r["end_date"], r["reason"]
+            emp, leave_type, days = _validate(r["employee_id"], r["leave_type"], start_date, end_date)
+        except KeyError as e:
+            raise ValueError(f"Record {i}: missing field {e}.") from e
+        except ValueError as e:
+            raise ValueError(f"Record {i}: {e}") from e
+        checked.append((emp, leave_type, start_date, end_date, days, reason))
+
+    now_str = _now().strftime("%Y-%m-%d %H:%M:%S")
+    return [_store(*item, now_str) for item in checked]
+
+
+def get_leave(leave_id: str) -> Optional[Leave]:
     return LEAVES.get(leave_id.upper())
 
 
-def get_all_leaves() -> list[dict]:
+def get_all_leaves() -> list[Leave]:
     return list(LEAVES.values())
 
 
-def get_pending_leaves() -> list[dict]:
-    return [l for l in LEAVES.values() if l["status"] == "pending"]
+def get_pending_leaves() -> list[Leave]:
+    return [LEAVES[lid] for lid in _PENDING_IDS]
 
 
-def get_employee_leaves(employee_id: str) -> list[dict]:
-    return [l for l in LEAVES.values() if l["employee_id"] == employee_id.upper()]
+def get_employee_leaves(employee_id: str) -> list[Leave]:
+    return [LEAVES[lid] for lid in _LEAVES_BY_EMP.get(employee_id.upper(), ())]
 
 
-def approve_leave_record(leave_id: str) -> dict:
-    record = LEAVES.get(leave_id.upper())
+def approve_leave_record(leave_id: str, *, _LEAVES=LEAVES, _PENDING=_PENDING_IDS,
+                         _adjust=_adjust_balance, _now=datetime.now,
+                         _changed=_leaves_changed) -> Leave:
+    record = _LEAVES.get(leave_id.upper())
     if not record:
         raise ValueError(f"Leave request '{leave_id}' not found.")
-    if record["status"] != "pending":
-        raise ValueError(f"Leave '{leave_id}' is already '{record['status']}'. Only pending leaves can be approved.")
+    if record.status != "pending":
+        raise ValueError(f"Leave '{leave_id}' is already '{record.status}'. Only pending leaves can be approved.")
 
     # Deduct from balance
-    emp = EMPLOYEES[record["employee_id"]]
-    emp["leave_balance"][record["leave_type"]] -= record["days"]
+    _adjust(record.employee_id, record.leave_type, -record.days)
 
-    record["status"] = "approved"
-    record["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    record.status = "approved"
+    _PENDING.pop(record.leave_id, None)
+    record.updated_at = _now().strftime("%Y-%m-%d %H:%M:%S")
+    _changed()
     return record
 
 
-def reject_leave_record(leave_id: str, rejection_reason: str) -> dict:
-    record = LEAVES.get(leave_id.upper())
+def approve_leaves_bulk(leave_ids: list[str], *, _LEAVES=LEAVES, _PENDING=_PENDING_IDS,
+                        _adjust=_adjust_balance, _now=datetime.now,
+                        _changed=_leaves_changed) -> list[tuple[Leave, int]]:
+    """
+    Approve several pending leaves at once. Every ID is checked first, so a
+    missing or non-pending leave raises without changing any record.
+    Repeated IDs are approved once. Returns (record, remaining balance right
+    after that record's deduction) pairs in approval order.
+    """
+    records: dict[str, Leave] = {}
+    for leave_id in leave_ids:
+        record = _LEAVES.get(leave_id.upper())
+        if not record:
+            raise ValueError(f"Leave request '{leave_id}' not found.")
+        if record.status != "pending":
+            raise ValueError(f"Leave '{leave_id}' is already '{record.status}'. Only pending leaves can be approved.")
+        records[record.leave_id] = record
+
+    now_str = _now().strftime("%Y-%m-%d %H:%M:%S")
+    approved = []
+    for lid, record in records.items():
+        remaining = _adjust(record.employee_id, record.leave_type, -record.days)
+        record.status = "approved"
+        _PENDING.pop(lid, None)
+        record.updated_at = now_str
+        approved.append((record, remaining))
+    _changed()
+    return approved
+
+
+def reject_leave_record(leave_id: str, rejection_reason: str, *, _LEAVES=LEAVES,
+                        _PENDING=_PENDING_IDS, _now=datetime.now,
+                        _changed=_leaves_changed) -> Leave:
+    record = _LEAVES.get(leave_id.upper())
     if not record:
         raise ValueError(f"Leave request '{leave_id}' not found.")
-    if record["status"] != "pending":
-        raise ValueError(f"Leave '{leave_id}' is already '{record['status']}'. Only pending leaves can be rejected.")
-
-    record["status"] = "rejected"
-    record["rejection_reason"] = rejection_reason
-    record["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if record.status != "pending":
+        raise ValueError(f"Leave '{leave_id}' is already '{record.status}'. Only pending leaves can be rejected.")
+
+    record.status = "rejected"
+    _PENDING.pop(record.leave_id, None)
+    record.rejection_reason = rejection_reason
+    record.updated_at = _now().strftime("%Y-%m-%d %H:%M:%S")
+    _changed()
     return record
 
 
-def cancel_leave_record(leave_id: str) -> dict:
-    record = LEAVES.get(leave_id.upper())
+def cancel_leave_record(leave_id: str, *, _LEAVES=LEAVES, _PENDING=_PENDING_IDS,
+                        _adjust=_adjust_balance, _now=datetime.now,
+                        _changed=_leaves_changed) -> Leave:
+    record = _LEAVES.get(leave_id.upper())
     if not record:
         raise ValueError(f"Leave request '{leave_id}' not found.")
-    if record["status"] not in ("pending", "approved"):
-        raise ValueError(f"Leave '{leave_id}' is '{record['status']}' and cannot be cancelled.")
+    if record.status not in ("pending", "approved"):
+        raise ValueError(f"Leave '{leave_id}' is '{record.status}' and cannot be cancelled.")
 
     # Restore balance if it was approved
-    if record["status"] == "approved":
-        emp = EMPLOYEES[record["employee_id"]]
-        emp["leave_balance"][record["leave_type"]] += record["days"]
+    if record.status == "approved":
+        _adjust(record.employee_id, record.leave_type, record.days)
 
-    record["status"] = "cancelled"
-    record["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    record.status = "cancelled"
+    _PENDING.pop(record.leave_id, None)
+    record.updated_at = _now().strftime("%Y-%m-%d %H:%M:%S")
+    _changed()
     return record
@@ -11,9 +11,15 @@ Run with:
 """
 
 import json
+from functools import lru_cache
 from mcp.server.fastmcp import FastMCP
 import db
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib
+    orjson = None
+
 # ─────────────────────────────────────────────
 #  SERVER SETUP
 # ─────────────────────────────────────────────
@@ -28,6 +34,47 @@ mcp = FastMCP(
     ),
 )
 
+# ─────────────────────────────────────────────
+#  FORMATTING CONSTANTS
+# ─────────────────────────────────────────────
+
+LEAVE_EMOJI = {"casual": "🌴", "sick": "🤒", "annual": "✈️", "maternity": "👶", "paternity": "👨‍👦"}
+STATUS_EMOJI = {"pending": "⏳", "approved": "✅", "rejected": "❌", "cancelled": "🚫"}
+
+# Row prefix per leave type for get_leave_balance, e.g. "  🌴 Casual      : "
+BALANCE_PREFIX = {t: f"  {LEAVE_EMOJI[t]} {t.capitalize():<12}: " for t in db.LEAVE_TYPES}
+
+
+if orjson is not None:
+    def _json(obj) -> str:
+        """Serialise obj (db records included) as JSON indented by two spaces."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+else:
+    def _json(obj) -> str:
+        """Serialise obj (db records included) as JSON indented by two spaces."""
+        # ensure_ascii=False matches orjson, which writes raw UTF-8.
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=lambda rec: rec.as_dict())
+
+
+def _pending_row(r: db.Leave) -> str:
+    """One line of the list_pending_leaves output."""
+    return (
+        f"  • [{r.leave_id}] {r.employee_name} ({r.employee_id}) — "
+        f"{r.leave_type.capitalize()} | {r.start_date} → {r.end_date} "
+        f"({r.days} day(s)) | Reason: {r.reason}"
+    )
+
+
+def _history_row(r: db.Leave) -> str:
+    """One line of the list_employee_leaves output."""
+    status = r.status
+    return (
+        f"  {STATUS_EMOJI.get(status, '📅')} [{r.leave_id}] {r.leave_type.capitalize()} | "
+        f"{r.start_date} → {r.end_date} ({r.days} day(s)) | "
+        f"Status: {status.upper()}"
+    )
+
+
 # ─────────────────────────────────────────────
 #  TOOLS
 # ─────────────────────────────────────────────
@@ -52,7 +99,7 @@ def get_employee_info(employee_id: str = "", name: str = "") -> str:
     if not emp:
         return f"❌ No employee found for id='{employee_id}' name='{name}'."
 
-    return json.dumps(emp, indent=2)
+    return json.dumps(emp.as_dict(), indent=2)
 
 
 @mcp.tool()
@@ -70,11 +117,11 @@ def get_leave_balance(employee_id: str) -> str:
     if not emp:
         return f"❌ Employee '{employee_id}' not found."
 
-    balance = emp["leave_balance"]
-    lines = [f"📊 Leave balance for {emp['name']} ({emp['id']}):"]
+    balance = emp.leave_balance
+    lines = [f"📊 Leave balance for {emp.name} ({emp.id}):"]
     for leave_type, days in balance.items():
-        emoji = {"casual": "🌴", "sick": "🤒", "annual": "✈️", "maternity": "👶", "paternity": "👨‍👦"}.get(leave_type, "📅")
-        lines.append(f"  {emoji} {leave_type.capitalize():<12}: {days} day(s)")
+        prefix = BALANCE_PREFIX.get(leave_type) or f"  📅 {leave_type.capitalize():<12}: "
+        lines.append(f"{prefix}{days} day(s)")
     return "\n".join(lines)
 
 
@@ -106,13 +153,13 @@ def apply_leave(
 
     return (
         f"✅ Leave request submitted successfully!\n"
-        f"   Leave ID   : {record['leave_id']}\n"
-        f"   Employee   : {record['employee_name']} ({record['employee_id']})\n"
-        f"   Type       : {record['leave_type'].capitalize()}\n"
-        f"   Period     : {record['start_date']} → {record['end_date']} ({record['days']} day(s))\n"
-        f"   Reason     : {record['reason']}\n"
-        f"   Status     : {record['status'].upper()}\n"
-        f"   Submitted  : {record['created_at']}"
+        f"   Leave ID   : {record.leave_id}\n"
+        f"   Employee   : {record.employee_name} ({record.employee_id})\n"
+        f"   Type       : {record.leave_type.capitalize()}\n"
+        f"   Period     : {record.start_date} → {record.end_date} ({record.days} day(s))\n"
+        f"   Reason     : {record.reason}\n"
+        f"   Status     : {record.status.upper()}\n"
+        f"   Submitted  : {record.created_at}"
     )
 
 
@@ -131,25 +178,20 @@ def get_leave_status(leave_id: str) -> str:
     if not record:
         return f"❌ Leave request '{leave_id}' not found."
 
-    status_emoji = {
-        "pending": "⏳",
-        "approved": "✅",
-        "rejected": "❌",
-        "cancelled": "🚫",
-    }.get(record["status"], "📋")
+    status_emoji = STATUS_EMOJI.get(record.status, "📋")
 
     lines = [
-        f"{status_emoji} Leave Request — {record['leave_id']}",
-        f"   Employee   : {record['employee_name']} ({record['employee_id']})",
-        f"   Type       : {record['leave_type'].capitalize()}",
-        f"   Period     : {record['start_date']} → {record['end_date']} ({record['days']} day(s))",
-        f"   Reason     : {record['reason']}",
-        f"   Status     : {record['status'].upper()}",
-        f"   Submitted  : {record['created_at']}",
-        f"   Updated    : {record['updated_at']}",
+        f"{status_emoji} Leave Request — {record.leave_id}",
+        f"   Employee   : {record.employee_name} ({record.employee_id})",
+        f"   Type       : {record.leave_type.capitalize()}",
+        f"   Period     : {record.start_date} → {record.end_date} ({record.days} day(s))",
+        f"   Reason     : {record.reason}",
+        f"   Status     : {record.status.upper()}",
+        f"   Submitted  : {record.created_at}",
+        f"   Updated    : {record.updated_at}",
     ]
-    if record["rejection_reason"]:
-        lines.append(f"   Rejection  : {record['rejection_reason']}")
+    if record.rejection_reason:
+        lines.append(f"   Rejection  : {record.rejection_reason}")
 
     return "\n".join(lines)
 
@@ -167,14 +209,9 @@ def list_pending_leaves() -> str:
     if not pending:
         return "✅ No pending leave requests at the moment."
 
-    lines = [f"⏳ Pending Leave Requests ({len(pending)} total):\n"]
-    for r in pending:
-        lines.append(
-            f"  • [{r['leave_id']}] {r['employee_name']} ({r['employee_id']}) — "
-            f"{r['leave_type'].capitalize()} | {r['start_date']} → {r['end_date']} "
-            f"({r['days']} day(s)) | Reason: {r['reason']}"
-        )
-    return "\n".join(lines)
+    header = f"⏳ Pending Leave Requests ({len(pending)} total):\n"
+    body = "\n".join(_pending_row(r) for r in pending)
+    return f"{header}\n{body}"
 
 
 @mcp.tool()
@@ -194,18 +231,11 @@ def list_employee_leaves(employee_id: str) -> str:
 
     leaves = db.get_employee_leaves(employee_id)
     if not leaves:
-        return f"📋 {emp['name']} has no leave requests on record."
+        return f"📋 {emp.name} has no leave requests on record."
 
-    status_emoji = {"pending": "⏳", "approved": "✅", "rejected": "❌", "cancelled": "🚫"}
-    lines = [f"📋 Leave History for {emp['name']} ({emp['id']}) — {len(leaves)} record(s):\n"]
-    for r in leaves:
-        emoji = status_emoji.get(r["status"], "📅")
-        lines.append(
-            f"  {emoji} [{r['leave_id']}] {r['leave_type'].capitalize()} | "
-            f"{r['start_date']} → {r['end_date']} ({r['days']} day(s)) | "
-            f"Status: {r['status'].upper()}"
-        )
-    return "\n".join(lines)
+    header = f"📋 Leave History for {emp.name} ({emp.id}) — {len(leaves)} record(s):\n"
+    body = "\n".join(_history_row(r) for r in leaves)
+    return f"{header}\n{body}"
 
 
 @mcp.tool()
@@ -224,17 +254,47 @@ def approve_leave(leave_id: str) -> str:
     except ValueError as e:
         return f"❌ Cannot approve: {e}"
 
-    emp = db.EMPLOYEES[record["employee_id"]]
-    remaining = emp["leave_balance"][record["leave_type"]]
+    emp = db.EMPLOYEES[record.employee_id]
+    remaining = emp.leave_balance[record.leave_type]
     return (
-        f"✅ Leave request '{record['leave_id']}' APPROVED!\n"
-        f"   Employee   : {record['employee_name']} ({record['employee_id']})\n"
-        f"   Type       : {record['leave_type'].capitalize()}\n"
-        f"   Period     : {record['start_date']} → {record['end_date']} ({record['days']} day(s))\n"
-        f"   Remaining {record['leave_type'].capitalize()} Balance: {remaining} day(s)"
+        f"✅ Leave request '{record.leave_id}' APPROVED!\n"
+        f"   Employee   : {record.employee_name} ({record.employee_id})\n"
+        f"   Type       : {record.leave_type.capitalize()}\n"
+        f"   Period     : {record.start_date} → {record.end_date} ({record.days} day(s))\n"
+        f"   Remaining {record.leave_type.capitalize()} Balance: {remaining} day(s)"
     )
 
 
+@mcp.tool()
+def approve_leaves(leave_ids: list[str]) -> str:
+    """
+    Approve several pending leave requests in one call, e.g. to clear the pending queue.
+    Either all of them are approved or, if any ID is invalid or not pending, none are.
+
+    Args:
+        leave_ids: The leave request IDs to approve (e.g., ['L001', 'L002']).
+
+    Returns:
+        Confirmation listing each approved leave and the employee's remaining balance.
+    """
+    if not leave_ids:
+        return "❌ Please provide at least one leave ID to approve."
+
+    try:
+        approved = db.approve_leaves_bulk(leave_ids)
+    except ValueError as e:
+        return f"❌ Cannot approve: {e}"
+
+    lines = [f"✅ {len(approved)} leave request(s) APPROVED!\n"]
+    for r, remaining in approved:
+        lines.append(
+            f"  • [{r.leave_id}] {r.employee_name} ({r.employee_id}) — "
+            f"{r.leave_type.capitalize()} | {r.start_date} → {r.end_date} "
+            f"({r.days} day(s)) | Remaining: {remaining} day(s)"
+        )
+    return "\n".join(lines)
+
+
 @mcp.tool()
 def reject_leave(leave_id: str, rejection_reason: str) -> str:
     """
@@ -253,11 +313,11 @@ def reject_leave(leave_id: str, rejection_reason: str) -> str:
         return f"❌ Cannot reject: {e}"
 
     return (
-        f"❌ Leave request '{record['leave_id']}' REJECTED.\n"
-        f"   Employee   : {record['employee_name']} ({record['employee_id']})\n"
-        f"   Type       : {record['leave_type'].capitalize()}\n"
-        f"   Period     : {record['start_date']} → {record['end_date']} ({record['days']} day(s))\n"
-        f"   Reason for Rejection: {record['rejection_reason']}"
+        f"❌ Leave request '{record.leave_id}' REJECTED.\n"
+        f"   Employee   : {record.employee_name} ({record.employee_id})\n"
+        f"   Type       : {record.leave_type.capitalize()}\n"
+        f"   Period     : {record.start_date} → {record.end_date} ({record.days} day(s))\n"
+        f"   Reason for Rejection: {record.rejection_reason}"
     )
 
 
@@ -277,21 +337,21 @@ def cancel_leave(leave_id: str) -> str:
     if not record:
         return f"❌ Leave request '{leave_id}' not found."
 
-    was_approved = record["status"] == "approved"
+    was_approved = record.status == "approved"
     try:
         record = db.cancel_leave_record(leave_id)
     except ValueError as e:
         return f"❌ Cannot cancel: {e}"
 
     msg = (
-        f"🚫 Leave request '{record['leave_id']}' CANCELLED.\n"
-        f"   Employee : {record['employee_name']} ({record['employee_id']})\n"
-        f"   Period   : {record['start_date']} → {record['end_date']} ({record['days']} day(s))\n"
+        f"🚫 Leave request '{record.leave_id}' CANCELLED.\n"
+        f"   Employee : {record.employee_name} ({record.employee_id})\n"
+        f"   Period   : {record.start_date} → {record.end_date} ({record.days} day(s))\n"
     )
     if was_approved:
-        emp = db.EMPLOYEES[record["employee_id"]]
-        restored = emp["leave_balance"][record["leave_type"]]
-        msg += f"   ✅ {record['days']} day(s) restored to {record['leave_type'].capitalize()} balance. New balance: {restored} day(s)"
+        emp = db.EMPLOYEES[record.employee_id]
+        restored = emp.leave_balance[record.leave_type]
+        msg += f"   ✅ {record.days} day(s) restored to {record.leave_type.capitalize()} balance. New balance: {restored} day(s)"
     return msg
 
 
@@ -300,33 +360,40 @@ def cancel_leave(leave_id: str) -> str:
 # ─────────────────────────────────────────────
 
 
+@lru_cache(maxsize=1)
+def _employees_json(version: int) -> str:
+    """Employee directory JSON for the given db.EMPLOYEES_VERSION."""
+    return _json(db.get_employee_directory())
+
+
 @mcp.resource("employees://list")
 def resource_employees_list() -> str:
     """Returns the full employee directory as JSON."""
-    employees = db.get_all_employees()
-    summary = []
-    for emp in employees:
-        summary.append({
-            "id": emp["id"],
-            "name": emp["name"],
-            "department": emp["department"],
-            "role": emp["role"],
-            "email": emp["email"],
-            "manager_id": emp["manager_id"],
-        })
-    return json.dumps(summary, indent=2)
+    return _employees_json(db.EMPLOYEES_VERSION)
+
+
+@lru_cache(maxsize=1)
+def _all_leaves_json(version: int) -> str:
+    """All-leaves JSON for the given db.LEAVES_VERSION."""
+    return _json(db.get_all_leaves())
+
+
+@lru_cache(maxsize=1)
+def _pending_leaves_json(version: int) -> str:
+    """Pending-leaves JSON for the given db.LEAVES_VERSION."""
+    return _json(db.get_pending_leaves())
 
 
 @mcp.resource("leaves://all")
 def resource_all_leaves() -> str:
     """Returns all leave requests across the organization as JSON."""
-    return json.dumps(db.get_all_leaves(), indent=2)
+    return _all_leaves_json(db.LEAVES_VERSION)
 
 
 @mcp.resource("leaves://pending")
 def resource_pending_leaves() -> str:
     """Returns only pending leave requests as JSON."""
-    return json.dumps(db.get_pending_leaves(), indent=2)
+    return _pending_leaves_json(db.LEAVES_VERSION)
 
 
 # ─────────────────────────────────────────────